@@ -0,0 +1,99 @@
+"""Startup and rerun profile for the Streamlit app.
+
+    python bench_rerun.py                   # profile app.py
+    python bench_rerun.py --app app2.py --reruns 50
+    python bench_rerun.py --connect         # also time connection setup to a running Ollama
+
+Reports the cold import cost of each module (in a fresh interpreter, so nothing is cached), the
+first script run and the rerun latency of a form interaction, measured with Streamlit's
+AppTest, and optionally the first and subsequent request on the cached Ollama client.
+
+Deferred imports only show up in the first run: on a rerun every module is already in
+``sys.modules``. To compare against an older version, point ``--app`` at a copy of its script,
+e.g. ``git show <commit>:app.py > /tmp/old/app.py``, and run from the same directory.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+MODULES = ("streamlit", "ollama", "pdfkit", "ebook", "planner", "render", "ui")
+
+
+def import_time(module: str) -> float:
+    """Seconds to import ``module`` in a fresh interpreter"""
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {module}; print(time.perf_counter() - start)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if result.returncode != 0:
+        # Not importable here, e.g. a module that the version being profiled does not have
+        return float("nan")
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def rerun_times(app: str, reruns: int) -> tuple:
+    """First run of ``app`` and the time of each rerun after typing into the title field"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(app, default_timeout=60)
+    start = time.perf_counter()
+    at.run()
+    first_run = time.perf_counter() - start
+
+    times = []
+    for i in range(reruns):
+        at.text_input[0].input(f"Benchmark title {i}")
+        start = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - start)
+    return first_run, times
+
+
+def connection_times(calls: int) -> list:
+    """Latency of lightweight requests on the cached client; the first one opens the connection"""
+    from resources import get_client
+
+    client = get_client()
+    times = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        client.list()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def ms(seconds: float) -> str:
+    return f"{seconds * 1000:9.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile app startup and rerun latency")
+    parser.add_argument("--app", default="app.py")
+    parser.add_argument("--reruns", type=int, default=20)
+    parser.add_argument("--connect", action="store_true", help="Time requests to a running Ollama")
+    args = parser.parse_args()
+
+    print("Cold import (fresh interpreter)")
+    for module in MODULES:
+        seconds = import_time(module)
+        print(f"  {module:<12}{'        -' if seconds != seconds else ms(seconds)}")
+
+    first_run, times = rerun_times(args.app, args.reruns)
+    print(f"\nScript runs of {args.app}")
+    print(f"  first run   {ms(first_run)}")
+    print(f"  rerun mean  {ms(statistics.mean(times))}")
+    print(f"  rerun p50   {ms(statistics.median(times))}")
+    print(f"  rerun max   {ms(max(times))}")
+
+    if args.connect:
+        times = connection_times(5)
+        print("\nOllama requests on the cached client")
+        print(f"  first       {ms(times[0])}")
+        print(f"  later mean  {ms(statistics.mean(times[1:]))}")
+
+
+if __name__ == "__main__":
+    main()
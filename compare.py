@@ -0,0 +1,130 @@
+"""Runs the same book spec through each prompt strategy and compares their cost.
+
+    python compare.py --title "The Lighthouse" --chapters 7 --words 350 --repeats 3
+
+The chapter list is generated once and shared by every run, sampling uses a fixed seed at
+temperature 0, and the model is unloaded before each run so Ollama's prompt cache starts
+empty and the order strategies run in does not change their prompt token counts.
+"""
+import argparse
+import functools
+import statistics
+import time
+
+from ebook import OLLAMA_MODEL, STRATEGIES, UsageMeter, create_chapters, default_generate, generate_book
+from planner import record_run
+
+
+def unload_model(generate, model: str):
+    """Ask Ollama to drop the model (and its prompt cache) from memory"""
+    generate(model=model, prompt="", keep_alive=0)
+
+
+def run_strategy(strategy, title, description, chapter_list, words, model=OLLAMA_MODEL, generate=None):
+    """Generate one book with ``strategy`` from a fixed ``chapter_list`` and return its usage figures"""
+    meter = UsageMeter(generate)
+    start = time.perf_counter()
+    for event, data in generate_book(
+        title=title,
+        description=description,
+        number_of_chapters=len(chapter_list),
+        words_per_chapter=words,
+        strategy=strategy,
+        generate=meter,
+        model=model,
+        chapter_list=chapter_list,
+    ):
+        if event == "chapter":
+            print(f"  [{strategy.name}] wrote chapter {data['number']}: {data['name']}")
+    # Comparison runs are real runs, so they also feed the planner's throughput figures
+    record_run(model, meter)
+    return {
+        "strategy": strategy.name,
+        "calls": meter.calls,
+        "prompt_words": meter.prompt_words,
+        "prompt_tokens": meter.prompt_tokens,
+        "generated_tokens": meter.generated_tokens,
+        "wall_time": time.perf_counter() - start,
+    }
+
+
+def summarise_runs(runs: list) -> dict:
+    """Mean of each figure over repeated runs of one strategy, plus the spread of wall time"""
+    result = {"strategy": runs[0]["strategy"], "repeats": len(runs)}
+    for field in ("calls", "prompt_words", "prompt_tokens", "generated_tokens", "wall_time"):
+        result[field] = statistics.mean(run[field] for run in runs)
+    result["wall_stdev"] = statistics.stdev(run["wall_time"] for run in runs) if len(runs) > 1 else 0.0
+    return result
+
+
+def format_report(results: list) -> str:
+    """Table of per-strategy means, cheapest (fewest total tokens) first"""
+    header = (
+        f"{'strategy':<10}{'runs':>5}{'calls':>7}{'prompt wds':>12}{'prompt tok':>12}"
+        f"{'gen tok':>10}{'total tok':>11}{'wall s':>10}{'± s':>8}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in sorted(results, key=lambda r: r["prompt_tokens"] + r["generated_tokens"]):
+        lines.append(
+            f"{r['strategy']:<10}{r['repeats']:>5}{r['calls']:>7.1f}{r['prompt_words']:>12.0f}"
+            f"{r['prompt_tokens']:>12.0f}{r['generated_tokens']:>10.0f}"
+            f"{r['prompt_tokens'] + r['generated_tokens']:>11.0f}{r['wall_time']:>10.1f}{r['wall_stdev']:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare token cost of the prompt strategies")
+    parser.add_argument("--title", required=True)
+    parser.add_argument("--description", default="")
+    parser.add_argument("--chapters", type=int, default=7)
+    parser.add_argument("--words", type=int, default=350)
+    parser.add_argument("--model", default=OLLAMA_MODEL)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeats", type=int, default=1, help="Runs per strategy (default: 1)")
+    parser.add_argument(
+        "--strategies",
+        nargs="+",
+        choices=sorted(STRATEGIES),
+        default=list(STRATEGIES),
+        help="Strategies to compare (default: all)",
+    )
+    args = parser.parse_args()
+
+    generate = functools.partial(default_generate(), options={"seed": args.seed, "temperature": 0})
+
+    # Every strategy writes the same book: one shared chapter list, not counted in any run
+    chapter_list = create_chapters(
+        number=args.chapters,
+        title=args.title,
+        description=args.description,
+        generate=generate,
+        model=args.model,
+    )
+    print(f"Chapters: {', '.join(chapter_list)}")
+
+    results = []
+    for name in args.strategies:
+        print(f"Running {name}: {STRATEGIES[name].description}")
+        runs = []
+        for _ in range(args.repeats):
+            unload_model(generate, args.model)
+            runs.append(
+                run_strategy(
+                    STRATEGIES[name],
+                    title=args.title,
+                    description=args.description,
+                    chapter_list=chapter_list,
+                    words=args.words,
+                    model=args.model,
+                    generate=generate,
+                )
+            )
+        results.append(summarise_runs(runs))
+
+    print()
+    print(format_report(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""Time and token planning from the throughput measured on previous runs.
+
+Throughput totals are kept per model in ``STATS_FILE``. ``estimate_run`` replays the pipeline's
+prompt sizes for a strategy without calling the model, and ``RunPlanner`` uses the same
+estimate during a run to keep the ETA current and hold the run to an optional budget.
+"""
+import json
+import os
+import threading
+import time
+
+from ebook import summary_length, write_json
+
+STATS_FILE = os.path.join("ebooks", "throughput.json")
+
+# Used until a model has been measured: conservative CPU-only figures
+DEFAULT_STATS = {
+    "prompt_tokens_per_second": 50.0,
+    "eval_tokens_per_second": 8.0,
+    "overhead_seconds_per_call": 1.0,
+    "tokens_per_word": 1.35,
+}
+
+# Totals that are accumulated from UsageMeter after each run
+TOTAL_FIELDS = (
+    "calls",
+    "prompt_tokens",
+    "generated_tokens",
+    "generated_words",
+    "prompt_seconds",
+    "eval_seconds",
+    "overhead_seconds",
+)
+
+# Summaries are never shrunk below this when adapting to a budget
+MIN_SUMMARY_WORDS = 20
+
+# Rough length of the chapter list reply per chapter name
+CHAPTER_NAME_WORDS = 5
+
+_stats_lock = threading.Lock()
+
+
+def _load_stats(path: str) -> dict:
+    """All stored totals, empty if there is no file yet. A file that does not parse raises
+    ValueError rather than being treated as empty, which would lose every model's history."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        raise ValueError(f"Could not read throughput stats from {path}: {e}") from e
+
+
+def load_totals(model: str, path: str = STATS_FILE) -> dict:
+    """Measured totals for ``model``, all zero if it has never been run"""
+    totals = _load_stats(path).get(model, {})
+    return {field: totals.get(field, 0) for field in TOTAL_FIELDS}
+
+
+def record_run(model: str, meter, path: str = STATS_FILE) -> dict:
+    """Add a finished run's UsageMeter figures to the stored totals for ``model``"""
+    # Sessions of one Streamlit server are threads; the atomic write covers other processes
+    with _stats_lock:
+        stats = _load_stats(path)
+        totals = stats.get(model, {})
+        totals = {field: totals.get(field, 0) + getattr(meter, field) for field in TOTAL_FIELDS}
+        stats[model] = totals
+        write_json(path, stats)
+    return totals
+
+
+def rates(totals: dict) -> dict:
+    """Turn measured totals into throughput rates, falling back to DEFAULT_STATS per field"""
+    result = dict(DEFAULT_STATS)
+    if totals["prompt_seconds"] > 0 and totals["prompt_tokens"] > 0:
+        result["prompt_tokens_per_second"] = totals["prompt_tokens"] / totals["prompt_seconds"]
+    if totals["eval_seconds"] > 0 and totals["generated_tokens"] > 0:
+        result["eval_tokens_per_second"] = totals["generated_tokens"] / totals["eval_seconds"]
+    if totals["calls"] > 0:
+        result["overhead_seconds_per_call"] = totals["overhead_seconds"] / totals["calls"]
+    if totals["generated_words"] > 0 and totals["generated_tokens"] > 0:
+        result["tokens_per_word"] = totals["generated_tokens"] / totals["generated_words"]
+    return result
+
+
+def _words(count: int) -> str:
+    return "word " * count
+
+
+def estimate_run(
+    strategy,
+    title: str,
+    description: str,
+    number_of_chapters: int,
+    words_per_chapter: int,
+    stats: dict,
+    start_chapter: int = 1,
+    summary_words: int = 0,
+    chapter_summary_words: int = None,
+    end_chapter: int = None,
+    include_chapter_list: bool = True,
+) -> dict:
+    """Predict calls, tokens and seconds for chapters ``start_chapter``..``end_chapter``.
+
+    Prompts are built with the strategy's own builders from placeholder text of the expected
+    length, so prompt sizes and compaction points follow the real pipeline. ``end_chapter``
+    defaults to the last chapter and ``summary_words`` is the size of the running summary
+    going into ``start_chapter``. The chapter list call is counted when starting from chapter 1
+    unless ``include_chapter_list`` is off, as it is for estimates made during a run.
+    """
+    if chapter_summary_words is None:
+        chapter_summary_words = summary_length(words_per_chapter)
+    tokens_per_word = stats["tokens_per_word"]
+    calls = 0
+    prompt_words = 0
+    generated_words = 0
+
+    def call(prompt, reply_words):
+        nonlocal calls, prompt_words, generated_words
+        calls += 1
+        prompt_words += len(prompt.split())
+        generated_words += reply_words
+
+    if include_chapter_list and start_chapter == 1:
+        # The chapter list prompt is short and fixed; its reply is a few words per chapter
+        call(_words(80) + title + " " + (description or ""), CHAPTER_NAME_WORDS * number_of_chapters)
+
+    for chapter_num in range(start_chapter, (end_chapter or number_of_chapters) + 1):
+        call(
+            strategy.chapter_prompt(
+                book_name=title,
+                book_description=description,
+                chapter_number=chapter_num,
+                chapter_name=_words(CHAPTER_NAME_WORDS),
+                summary_so_far=_words(summary_words),
+                previous_chapter_text=_words(words_per_chapter) if chapter_num > 1 else "",
+                number_of_words=words_per_chapter,
+                total_chapters=number_of_chapters,
+            ),
+            words_per_chapter,
+        )
+        call(
+            strategy.summary_prompt(
+                input=_words(words_per_chapter), number_of_words=chapter_summary_words
+            ),
+            chapter_summary_words,
+        )
+
+        # "Chapter N Summary:" heading added to every entry
+        entry_words = chapter_summary_words + 3
+        if strategy.compact_before_append:
+            if summary_words > strategy.compact_threshold:
+                call(strategy.compact_prompt(_words(summary_words)), 600)
+                summary_words = 600
+            summary_words += entry_words
+        else:
+            summary_words += entry_words
+            if summary_words > strategy.compact_threshold:
+                call(strategy.compact_prompt(_words(summary_words)), 600)
+                summary_words = 600
+
+    prompt_tokens = round(prompt_words * tokens_per_word)
+    generated_tokens = round(generated_words * tokens_per_word)
+    return {
+        "calls": calls,
+        "prompt_tokens": prompt_tokens,
+        "generated_tokens": generated_tokens,
+        "seconds": (
+            prompt_tokens / stats["prompt_tokens_per_second"]
+            + generated_tokens / stats["eval_tokens_per_second"]
+            + calls * stats["overhead_seconds_per_call"]
+        ),
+    }
+
+
+def format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m"
+    if minutes:
+        return f"{minutes}m {seconds:02d}s"
+    return f"{seconds}s"
+
+
+class RunPlanner:
+    """Tracks a run against its estimate and an optional time and/or token budget.
+
+    Pass it to ``ebook.generate_book`` as ``budget``. Before each chapter it projects the rest of
+    the run from the stored rates combined with what this run has measured so far. If the
+    projection goes over budget the chapter summaries are shortened; if even the next chapter
+    would not fit, ``plan_chapter`` returns ``None`` so the run stops with a checkpoint.
+    ``history`` takes the place of the totals stored at ``stats_path`` when given.
+    """
+
+    def __init__(
+        self,
+        strategy,
+        title: str,
+        description: str,
+        number_of_chapters: int,
+        words_per_chapter: int,
+        model: str,
+        meter,
+        max_seconds: float = None,
+        max_tokens: int = None,
+        stats_path: str = STATS_FILE,
+        history: dict = None,
+    ):
+        self.strategy = strategy
+        self.title = title
+        self.description = description
+        self.number_of_chapters = number_of_chapters
+        self.words_per_chapter = words_per_chapter
+        self.meter = meter
+        self.max_seconds = max_seconds
+        self.max_tokens = max_tokens
+        self.abort_reason = ""
+        self._history = history if history is not None else load_totals(model, stats_path)
+        self._start = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+    @property
+    def used_tokens(self) -> int:
+        return self.meter.prompt_tokens + self.meter.generated_tokens
+
+    def stats(self) -> dict:
+        """Rates from previous runs plus everything measured in this one"""
+        totals = {field: self._history[field] + getattr(self.meter, field) for field in TOTAL_FIELDS}
+        return rates(totals)
+
+    def estimate(
+        self,
+        start_chapter: int = 1,
+        summary_words: int = 0,
+        chapter_summary_words: int = None,
+        end_chapter: int = None,
+    ) -> dict:
+        return estimate_run(
+            self.strategy,
+            self.title,
+            self.description,
+            self.number_of_chapters,
+            self.words_per_chapter,
+            self.stats(),
+            start_chapter=start_chapter,
+            summary_words=summary_words,
+            chapter_summary_words=chapter_summary_words,
+            end_chapter=end_chapter,
+            # The chapter list is written before the first chapter, and already in the meter
+            include_chapter_list=False,
+        )
+
+    def eta(self, next_chapter: int, summary_words: int) -> float:
+        """Seconds left to write chapters ``next_chapter`` onwards"""
+        if next_chapter > self.number_of_chapters:
+            return 0.0
+        return self.estimate(next_chapter, summary_words)["seconds"]
+
+    def _fits(self, estimate: dict) -> bool:
+        if self.max_seconds and self.elapsed + estimate["seconds"] > self.max_seconds:
+            return False
+        if self.max_tokens and (
+            self.used_tokens + estimate["prompt_tokens"] + estimate["generated_tokens"] > self.max_tokens
+        ):
+            return False
+        return True
+
+    def plan_chapter(self, chapter_num: int, summary_words: int):
+        """Summary length to use for ``chapter_num``, or ``None`` to stop the run here"""
+        default_length = summary_length(self.words_per_chapter)
+        if not (self.max_seconds or self.max_tokens):
+            return default_length
+
+        # Shrink the chapter summaries until the rest of the book fits
+        length = default_length
+        while True:
+            if self._fits(self.estimate(chapter_num, summary_words, length)):
+                return length
+            if length == MIN_SUMMARY_WORDS:
+                break
+            length = max(length // 2, MIN_SUMMARY_WORDS)
+
+        # The whole book no longer fits: keep going while the next chapter does
+        next_chapter = self.estimate(chapter_num, summary_words, MIN_SUMMARY_WORDS, end_chapter=chapter_num)
+        if self._fits(next_chapter):
+            return MIN_SUMMARY_WORDS
+
+        if self.max_seconds and self.elapsed + next_chapter["seconds"] > self.max_seconds:
+            self.abort_reason = f"time budget of {format_duration(self.max_seconds)} reached"
+        else:
+            self.abort_reason = f"token budget of {self.max_tokens} reached"
+        return None
@@ -0,0 +1,200 @@
+"""Output formats for a finished book.
+
+Every renderer is a module level function taking ``(title, chapters, file_path)`` so it can be
+shipped to a worker process; ``chapters`` is the list of ``(chapter_name, chapter_text)`` pairs
+produced by ``ebook.generate_book``.
+"""
+import html
+import multiprocessing
+import os
+import uuid
+import zipfile
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def chapters_to_html(chapters: list) -> str:
+    """Lays out ``(chapter_name, chapter_text)`` pairs as the HTML used for the PDF"""
+    ebook_content = ""
+    for i, (chapter, text) in enumerate(chapters):
+        ebook_content += f"<h1>Chapter {i + 1}: {chapter}</h1> \n\n"
+        ebook_content += "<p>" + text.replace("\n", "</p><p>") + "</p><br/><br/><br/>"
+    return ebook_content
+
+
+def _paragraphs(text: str) -> list:
+    return [p.strip() for p in text.split("\n") if p.strip()]
+
+
+def _chapter_xhtml(number: int, chapter: str, text: str) -> str:
+    body = "\n".join(f"<p>{html.escape(p)}</p>" for p in _paragraphs(text))
+    return f"<h1>Chapter {number}: {html.escape(chapter)}</h1>\n{body}\n"
+
+
+def render_pdf(title: str, chapters: list, file_path: str) -> str:
+    import pdfkit
+
+    pdfkit.from_string(chapters_to_html(chapters), file_path, options={"encoding": "UTF-8"})
+    return file_path
+
+
+def render_html(title: str, chapters: list, file_path: str) -> str:
+    body = "\n".join(
+        _chapter_xhtml(i + 1, chapter, text) for i, (chapter, text) in enumerate(chapters)
+    )
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(
+            f"<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\"/>\n"
+            f"<title>{html.escape(title)}</title>\n</head>\n<body>\n{body}</body>\n</html>\n"
+        )
+    return file_path
+
+
+def render_markdown(title: str, chapters: list, file_path: str) -> str:
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(f"# {title}\n\n")
+        for i, (chapter, text) in enumerate(chapters):
+            f.write(f"## Chapter {i + 1}: {chapter}\n\n")
+            f.write("\n\n".join(_paragraphs(text)) + "\n\n")
+    return file_path
+
+
+def render_text(title: str, chapters: list, file_path: str) -> str:
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(f"{title}\n\n")
+        for i, (chapter, text) in enumerate(chapters):
+            f.write(f"Chapter {i + 1}: {chapter}\n\n")
+            f.write("\n\n".join(_paragraphs(text)) + "\n\n\n")
+    return file_path
+
+
+def render_epub(title: str, chapters: list, file_path: str) -> str:
+    """Minimal EPUB 3 container, written directly so no extra dependency is needed"""
+    book_id = f"urn:uuid:{uuid.uuid4()}"
+    modified = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    escaped_title = html.escape(title)
+    items = [f"chapter{i + 1}.xhtml" for i in range(len(chapters))]
+
+    manifest = "\n".join(
+        f'    <item id="c{i + 1}" href="{item}" media-type="application/xhtml+xml"/>'
+        for i, item in enumerate(items)
+    )
+    spine = "\n".join(f'    <itemref idref="c{i + 1}"/>' for i in range(len(items)))
+    nav_links = "\n".join(
+        f'      <li><a href="{item}">Chapter {i + 1}: {html.escape(chapter)}</a></li>'
+        for i, (item, (chapter, _)) in enumerate(zip(items, chapters))
+    )
+
+    def xhtml(page_title, body):
+        return (
+            '<?xml version="1.0" encoding="utf-8"?>\n<!DOCTYPE html>\n'
+            '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">\n'
+            f"<head><title>{page_title}</title></head>\n<body>\n{body}</body>\n</html>\n"
+        )
+
+    with zipfile.ZipFile(file_path, "w") as epub:
+        # The mimetype entry must come first and be stored uncompressed
+        epub.writestr("mimetype", "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+        epub.writestr(
+            "META-INF/container.xml",
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">\n'
+            '  <rootfiles>\n'
+            '    <rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>\n'
+            '  </rootfiles>\n'
+            '</container>\n',
+            compress_type=zipfile.ZIP_DEFLATED,
+        )
+        epub.writestr(
+            "OEBPS/content.opf",
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="book-id">\n'
+            '  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/">\n'
+            f'    <dc:identifier id="book-id">{book_id}</dc:identifier>\n'
+            f"    <dc:title>{escaped_title}</dc:title>\n"
+            "    <dc:language>en</dc:language>\n"
+            f'    <meta property="dcterms:modified">{modified}</meta>\n'
+            "  </metadata>\n"
+            "  <manifest>\n"
+            '    <item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>\n'
+            f"{manifest}\n"
+            "  </manifest>\n"
+            f"  <spine>\n{spine}\n  </spine>\n"
+            "</package>\n",
+            compress_type=zipfile.ZIP_DEFLATED,
+        )
+        epub.writestr(
+            "OEBPS/nav.xhtml",
+            xhtml(escaped_title, f'<nav epub:type="toc">\n  <ol>\n{nav_links}\n  </ol>\n</nav>\n'),
+            compress_type=zipfile.ZIP_DEFLATED,
+        )
+        for i, (item, (chapter, text)) in enumerate(zip(items, chapters)):
+            epub.writestr(
+                f"OEBPS/{item}",
+                xhtml(html.escape(chapter), _chapter_xhtml(i + 1, chapter, text)),
+                compress_type=zipfile.ZIP_DEFLATED,
+            )
+    return file_path
+
+
+# format -> (renderer, file extension, mime type, download label)
+FORMATS = {
+    "pdf": (render_pdf, "pdf", "application/pdf", "Download Ebook"),
+    "epub": (render_epub, "epub", "application/epub+zip", "Download EPUB"),
+    "html": (render_html, "html", "text/html", "Download HTML"),
+    "md": (render_markdown, "md", "text/markdown", "Download Markdown"),
+    "txt": (render_text, "txt", "text/plain", "Download Text"),
+}
+
+
+def new_render_pool(max_workers: int = len(FORMATS)) -> ProcessPoolExecutor:
+    """Process pool for the renderers.
+
+    Workers are started from a clean server process rather than forked from the caller, which
+    in the app is the multi-threaded Streamlit server. Like spawned ones, each worker still
+    re-imports the caller's main script (the ``streamlit`` CLI under ``streamlit run``) when it
+    starts, so keep the pool around rather than making one per book.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        # Import the renderers once in the server instead of in every worker
+        context.set_forkserver_preload(["render"])
+    else:
+        context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+
+
+def render_all(title: str, chapters: list, out_dir: str = "ebooks", formats=None, executor=None):
+    """Render every format in parallel, yielding ``(format, file_path, error)`` as each finishes.
+
+    The renderers run in ``executor`` (a process pool sized to the number of formats when not
+    given), so the total time is that of the slowest format rather than the sum of all of them.
+    A format that could not be rendered, including because the pool is broken, is yielded with
+    its exception.
+    """
+    formats = list(formats or FORMATS)
+    os.makedirs(out_dir, exist_ok=True)
+    base_name = title.strip().replace(" ", "_")
+
+    own_executor = executor is None
+    if own_executor:
+        executor = new_render_pool(len(formats))
+    try:
+        futures = {}
+        for fmt in formats:
+            renderer, extension, _, _ = FORMATS[fmt]
+            file_path = os.path.join(out_dir, f"{base_name}.{extension}")
+            try:
+                futures[executor.submit(renderer, title, chapters, file_path)] = (fmt, file_path)
+            except Exception as e:
+                yield fmt, file_path, e
+
+        for future in as_completed(futures):
+            fmt, file_path = futures[future]
+            try:
+                yield fmt, future.result(), None
+            except Exception as e:
+                yield fmt, file_path, e
+    finally:
+        if own_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,44 @@
+"""Process wide resources for the Streamlit app.
+
+Streamlit re-executes the script on every widget interaction, so anything expensive to build
+lives here behind ``st.cache_resource`` and is created once per server process, the first time
+a book is actually generated. The imports of ``ollama``/``httpx`` are deferred to that point too.
+"""
+import os
+import streamlit as st
+
+from render import new_render_pool
+
+# None lets ollama fall back to its own default (OLLAMA_HOST or http://127.0.0.1:11434)
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST")
+# Seconds to wait for the TCP connection to Ollama
+CONNECT_TIMEOUT = float(os.environ.get("OLLAMA_CONNECT_TIMEOUT", 10))
+# Seconds to wait for a single generate call. Unset means no limit, as with ollama's own client:
+# a long chapter on a CPU host can take well over a quarter of an hour
+REQUEST_TIMEOUT = float(os.environ["OLLAMA_REQUEST_TIMEOUT"]) if os.environ.get("OLLAMA_REQUEST_TIMEOUT") else None
+# How long an idle connection is kept open for the next call
+KEEPALIVE_EXPIRY = 300
+
+
+@st.cache_resource
+def get_client():
+    """Ollama client with a pooled, kept-alive HTTP connection shared by every session"""
+    import httpx
+    import ollama
+
+    return ollama.Client(
+        host=OLLAMA_HOST,
+        timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=4, max_keepalive_connections=4, keepalive_expiry=KEEPALIVE_EXPIRY
+        ),
+    )
+
+
+@st.cache_resource
+def get_render_pool():
+    """Worker processes for ``render.render_all``, started once instead of per book.
+
+    If a worker dies the pool is broken for good; callers ``get_render_pool.clear()`` and ask again.
+    """
+    return new_render_pool()
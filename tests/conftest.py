@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+# The app modules live at the top of the repository rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def response_words():
+    """Length of the fake chapter and summary replies; override it in a test module to change it"""
+    return 100
+
+
+@pytest.fixture
+def fake_generate(response_words):
+    """Stands in for ``ollama.generate`` with fixed token counts and timings"""
+
+    def generate(model, prompt, **kwargs):
+        if "chapters for an ebook" in prompt:
+            return {"response": "Arrival, Storm, Door, Below, Return"}
+        return {
+            "response": " ".join(["word"] * response_words),
+            "prompt_eval_count": 500,
+            "eval_count": 130,
+            "prompt_eval_duration": 1_000_000_000,
+            "eval_duration": 2_000_000_000,
+            "total_duration": 3_500_000_000,
+        }
+
+    return generate
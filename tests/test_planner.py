@@ -0,0 +1,186 @@
+import json
+
+import pytest
+
+from ebook import STRATEGIES, UsageMeter, checkpoint_path, generate_book, load_checkpoint, summary_length
+from planner import DEFAULT_STATS, TOTAL_FIELDS, RunPlanner, estimate_run, load_totals, rates, record_run
+
+STRATEGY = STRATEGIES["app"]
+
+
+def estimate(**kwargs):
+    return estimate_run(STRATEGY, "T", "", 7, 350, DEFAULT_STATS, **kwargs)
+
+
+def planner(meter, **kwargs):
+    history = {field: 0 for field in TOTAL_FIELDS}
+    return RunPlanner(STRATEGY, "T", "", 7, 350, "m", meter, history=history, **kwargs)
+
+
+def test_estimate_run_counts_calls():
+    # One chapter list call, then a chapter and a summary call per chapter
+    assert estimate()["calls"] == 1 + 7 * 2
+    assert estimate(include_chapter_list=False)["calls"] == 7 * 2
+    assert estimate(start_chapter=3)["calls"] == 5 * 2
+    assert estimate(start_chapter=3, end_chapter=3)["calls"] == 2
+
+
+def test_estimate_run_counts_compaction():
+    # app compacts before appending once the running summary is over 1200 words
+    assert estimate(start_chapter=7, summary_words=1201)["calls"] == 3
+    assert estimate(start_chapter=7, summary_words=1200)["calls"] == 2
+
+
+def test_estimate_run_seconds_follow_rates():
+    stats = dict(
+        DEFAULT_STATS, prompt_tokens_per_second=100.0, eval_tokens_per_second=10.0, overhead_seconds_per_call=0.0
+    )
+    result = estimate_run(STRATEGY, "T", "", 7, 350, stats)
+    assert result["seconds"] == pytest.approx(result["prompt_tokens"] / 100 + result["generated_tokens"] / 10)
+
+
+def test_rates_from_meter_totals(fake_generate):
+    meter = UsageMeter(fake_generate)
+    meter(model="m", prompt="write")
+    result = rates({field: getattr(meter, field) for field in TOTAL_FIELDS})
+    assert result["prompt_tokens_per_second"] == 500
+    assert result["eval_tokens_per_second"] == 65
+    assert result["overhead_seconds_per_call"] == pytest.approx(0.5)
+    assert result["tokens_per_word"] == pytest.approx(1.3)
+
+
+def test_plan_chapter_without_budget_keeps_summary_length(fake_generate):
+    assert planner(UsageMeter(fake_generate)).plan_chapter(1, 0) == summary_length(350)
+
+
+def test_plan_chapter_does_not_count_chapter_list_twice(fake_generate):
+    run = planner(UsageMeter(fake_generate))
+    assert run.estimate(1)["calls"] == 7 * 2
+
+
+def test_plan_chapter_shrinks_summaries_to_fit(fake_generate):
+    full = estimate(include_chapter_list=False)
+    shortest = estimate(include_chapter_list=False, chapter_summary_words=20)
+    # Halfway between the book with full summaries and with the shortest ones
+    budget = (
+        full["prompt_tokens"] + full["generated_tokens"] + shortest["prompt_tokens"] + shortest["generated_tokens"]
+    ) // 2
+
+    length = planner(UsageMeter(fake_generate), max_tokens=budget).plan_chapter(1, 0)
+    assert 20 <= length < summary_length(350)
+
+
+def test_plan_chapter_stops_when_next_chapter_does_not_fit(fake_generate):
+    meter = UsageMeter(fake_generate)
+    meter(model="m", prompt="write")
+    run = planner(meter, max_tokens=meter.prompt_tokens + meter.generated_tokens + 10)
+
+    assert run.plan_chapter(4, 300) is None
+    assert "token budget" in run.abort_reason
+
+
+def test_record_run_accumulates(tmp_path, fake_generate):
+    path = str(tmp_path / "throughput.json")
+    meter = UsageMeter(fake_generate)
+    meter(model="m", prompt="write")
+
+    record_run("m", meter, path)
+    record_run("m", meter, path)
+    assert load_totals("m", path)["calls"] == 2
+    assert load_totals("other", path)["calls"] == 0
+
+
+def test_record_run_keeps_unreadable_stats(tmp_path, fake_generate):
+    path = tmp_path / "throughput.json"
+    path.write_text('{"m": {"calls"')
+
+    with pytest.raises(ValueError):
+        record_run("m", UsageMeter(fake_generate), str(path))
+    assert path.read_text() == '{"m": {"calls"'
+
+
+class StopAt:
+    """Budget stand-in that stops the run before ``chapter``"""
+
+    abort_reason = "test budget reached"
+
+    def __init__(self, chapter):
+        self.chapter = chapter
+
+    def plan_chapter(self, chapter_num, summary_words):
+        return None if chapter_num == self.chapter else 50
+
+
+def test_abort_saves_checkpoint_and_resume_finishes(tmp_path, fake_generate):
+    events = list(
+        generate_book("T", "", 5, 350, STRATEGY, generate=fake_generate, budget=StopAt(3), checkpoint_dir=str(tmp_path))
+    )
+    aborted = dict(events)["aborted"]
+    assert aborted["number"] == 3
+    assert len(events[-1][1]["chapters"]) == 2
+
+    checkpoint = load_checkpoint(aborted["checkpoint"])
+    assert [chapter for chapter, _ in checkpoint["chapters"]] == ["Arrival", "Storm"]
+    assert checkpoint["summary_so_far"].count("Summary:") == 2
+
+    events = list(generate_book("T", "", 5, 350, STRATEGY, generate=fake_generate, resume=checkpoint))
+    kinds = [event for event, _ in events]
+    assert "creating_chapters" not in kinds
+    assert [data["number"] for event, data in events if event == "chapter"] == [3, 4, 5]
+    assert [chapter for chapter, _ in events[-1][1]["chapters"]] == ["Arrival", "Storm", "Door", "Below", "Return"]
+
+
+def test_failed_call_checkpoints_completed_chapters(tmp_path, fake_generate):
+    calls = 0
+
+    def failing_generate(model, prompt, **kwargs):
+        nonlocal calls
+        calls += 1
+        # 1 chapter list call, then chapter and summary calls: the 6th is chapter 3's summary
+        if calls == 6:
+            raise ConnectionError("Ollama went away")
+        return fake_generate(model, prompt)
+
+    events = []
+    with pytest.raises(ConnectionError):
+        for event in generate_book("T", "", 5, 350, STRATEGY, generate=failing_generate, checkpoint_dir=str(tmp_path)):
+            events.append(event)
+    assert events[-1] == ("checkpointed", {"checkpoint": str(tmp_path / "T.app.checkpoint.json"), "chapters": 2})
+
+    with open(tmp_path / "T.app.checkpoint.json", encoding="utf-8") as f:
+        checkpoint = json.load(f)
+    assert [chapter for chapter, _ in checkpoint["chapters"]] == ["Arrival", "Storm"]
+    assert checkpoint["summary_so_far"].count("Summary:") == 2
+
+
+def test_checkpoints_are_per_strategy(tmp_path, fake_generate):
+    # app0 stops after one chapter, then app stops after three under the same title
+    for name, stop in (("app0", 2), ("app", 4)):
+        budget = StopAt(stop)
+        list(generate_book("Shared", "", 5, 350, STRATEGIES[name], generate=fake_generate, budget=budget,
+                           checkpoint_dir=str(tmp_path)))
+
+    assert checkpoint_path("Shared", "app0", str(tmp_path)) != checkpoint_path("Shared", "app", str(tmp_path))
+    assert len(load_checkpoint(checkpoint_path("Shared", "app0", str(tmp_path)))["chapters"]) == 1
+    assert len(load_checkpoint(checkpoint_path("Shared", "app", str(tmp_path)))["chapters"]) == 3
+
+
+def test_failure_before_any_chapter_writes_no_checkpoint(tmp_path):
+    def failing_generate(model, prompt, **kwargs):
+        raise ConnectionError("Ollama went away")
+
+    events = []
+    with pytest.raises(ConnectionError):
+        for event in generate_book("T", "", 5, 350, STRATEGY, generate=failing_generate, checkpoint_dir=str(tmp_path)):
+            events.append(event)
+    assert "checkpointed" not in [event for event, _ in events]
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize("content", ['{"strategy": "app"}', "[]", '{"chapters": 3}'])
+def test_load_checkpoint_rejects_incomplete_files(tmp_path, content):
+    path = tmp_path / "T.app.checkpoint.json"
+    path.write_text(content)
+
+    with pytest.raises(ValueError):
+        load_checkpoint(str(path))
@@ -0,0 +1,55 @@
+import xml.etree.ElementTree as ET
+import zipfile
+
+from render import render_all, render_epub
+
+CHAPTERS = [("Arrival & Storm", "First line\nSecond <line>"), ("Return", "The end")]
+
+OPF = "{http://www.idpf.org/2007/opf}"
+
+
+def test_render_epub_structure(tmp_path):
+    file_path = render_epub("My <Book>", CHAPTERS, str(tmp_path / "book.epub"))
+
+    with zipfile.ZipFile(file_path) as epub:
+        names = epub.namelist()
+        # mimetype must be the first entry and stored uncompressed
+        assert names[0] == "mimetype"
+        assert epub.getinfo("mimetype").compress_type == zipfile.ZIP_STORED
+        assert epub.read("mimetype") == b"application/epub+zip"
+
+        container = ET.fromstring(epub.read("META-INF/container.xml"))
+        rootfile = container.find(".//{urn:oasis:names:tc:opendocument:xmlns:container}rootfile")
+        assert rootfile.get("full-path") == "OEBPS/content.opf"
+
+        package = ET.fromstring(epub.read("OEBPS/content.opf"))
+        assert package.find(".//{http://purl.org/dc/elements/1.1/}title").text == "My <Book>"
+        manifest = {item.get("id"): item.get("href") for item in package.iter(f"{OPF}item")}
+        spine = [itemref.get("idref") for itemref in package.iter(f"{OPF}itemref")]
+        assert spine == ["c1", "c2"]
+        for idref in spine:
+            assert f"OEBPS/{manifest[idref]}" in names
+        assert "OEBPS/nav.xhtml" in names
+
+        # Every page has to be well formed XHTML, with the text escaped
+        for name in names:
+            if name.endswith(".xhtml"):
+                ET.fromstring(epub.read(name))
+        chapter = epub.read("OEBPS/chapter1.xhtml").decode()
+        assert "<h1>Chapter 1: Arrival &amp; Storm</h1>" in chapter
+        assert "<p>Second &lt;line&gt;</p>" in chapter
+
+
+def test_render_all_yields_every_format(tmp_path):
+    results = {
+        fmt: (file_path, error)
+        for fmt, file_path, error in render_all(
+            "My Book", CHAPTERS, out_dir=str(tmp_path), formats=["epub", "html", "md", "txt"]
+        )
+    }
+
+    assert set(results) == {"epub", "html", "md", "txt"}
+    for file_path, error in results.values():
+        assert error is None
+    with open(results["md"][0], encoding="utf-8") as f:
+        assert f.read().startswith("# My Book\n\n## Chapter 1: Arrival & Storm\n\nFirst line\n\nSecond <line>")
@@ -0,0 +1,115 @@
+import pytest
+
+import baseline_app
+import baseline_app0
+import baseline_app2
+from ebook import STRATEGIES, PromptStrategy, create_chapters, generate_book
+
+BASELINES = {"app0": baseline_app0, "app": baseline_app, "app2": baseline_app2}
+
+
+class RecordingOllama:
+    """Stands in for the ollama module: echoes each prompt back as the response"""
+
+    def __init__(self):
+        self.prompts = []
+
+    def generate(self, model, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return {"response": prompt}
+
+
+def baseline_prompt(module, function, **kwargs):
+    module.ollama = RecordingOllama()
+    getattr(module, function)(**kwargs)
+    return module.ollama.prompts[-1]
+
+
+def test_prompt_strategy_is_abstract():
+    with pytest.raises(TypeError):
+        PromptStrategy()
+
+
+@pytest.mark.parametrize("name", BASELINES)
+@pytest.mark.parametrize("chapter_number", range(1, 8))
+def test_chapter_prompt_matches_baseline(name, chapter_number):
+    kwargs = dict(
+        book_name="The Lighthouse",
+        book_description="A keeper finds a door in the rock",
+        chapter_number=chapter_number,
+        chapter_name="The Door",
+        summary_so_far="Chapter 1 Summary: the keeper arrives \n\nChapter 2 Summary: a storm \n\n",
+        number_of_words=350,
+        total_chapters=7,
+    )
+    previous_chapter_text = "First paragraph.\n\nThe light went out."
+    baseline_kwargs = dict(kwargs)
+    if name == "app2":
+        baseline_kwargs["previous_chapter_text"] = previous_chapter_text
+
+    expected = baseline_prompt(BASELINES[name], "write_next_chapter", **baseline_kwargs)
+    actual = STRATEGIES[name].chapter_prompt(previous_chapter_text=previous_chapter_text, **kwargs)
+    assert actual == expected
+
+
+@pytest.mark.parametrize("name", BASELINES)
+def test_summary_and_compact_prompts_match_baseline(name):
+    strategy = STRATEGIES[name]
+    module = BASELINES[name]
+
+    expected = baseline_prompt(module, "summarize", input="Chapter text", number_of_words=50)
+    assert strategy.summary_prompt(input="Chapter text", number_of_words=50) == expected
+
+    if name == "app2":
+        expected = baseline_prompt(module, "structure_full_summary", summary_so_far="Long summary")
+    else:
+        expected = baseline_prompt(module, "summarize", input="Long summary", number_of_words=600)
+    assert strategy.compact_prompt("Long summary") == expected
+
+
+def test_create_chapters_matches_baseline():
+    fake = RecordingOllama()
+    create_chapters(7, "The Lighthouse", "", generate=fake.generate)
+    expected = baseline_prompt(baseline_app, "create_chapters", number=7, title="The Lighthouse", description="")
+    assert fake.prompts[-1] == expected
+
+
+@pytest.fixture
+def response_words():
+    # Long enough replies that the running summary reaches each strategy's compaction threshold
+    return 300
+
+
+@pytest.mark.parametrize("name", BASELINES)
+def test_generate_book_writes_every_chapter(name, fake_generate):
+    events = list(generate_book("T", "", 5, 350, STRATEGIES[name], generate=fake_generate))
+    kinds = [event for event, _ in events]
+
+    assert kinds[:2] == ["creating_chapters", "chapters"]
+    assert kinds.count("chapter") == 5
+    assert kinds.count("summary") == 5
+    assert kinds[-1] == "done"
+    assert [chapter for chapter, _ in events[-1][1]["chapters"]] == ["Arrival", "Storm", "Door", "Below", "Return"]
+
+
+def test_generate_book_compacts_at_strategy_threshold(fake_generate):
+    # Every 300 word summary grows the running summary by 303 words, so app2 (800 words,
+    # compacting after appending) compacts on chapter 3 and app (1200, before) on chapter 5
+    def compacted_at(name):
+        events = generate_book("T", "", 5, 350, STRATEGIES[name], generate=fake_generate)
+        chapter = None
+        for event, data in events:
+            if event == "writing":
+                chapter = data["number"]
+            if event == "compacting":
+                return chapter
+
+    assert compacted_at("app2") == 3
+    assert compacted_at("app") == 5
+
+
+def test_generate_book_uses_given_chapter_list(fake_generate):
+    events = list(generate_book("T", "", 2, 350, STRATEGIES["app"], generate=fake_generate, chapter_list=["A", "B"]))
+
+    assert "creating_chapters" not in [event for event, _ in events]
+    assert [chapter for chapter, _ in events[-1][1]["chapters"]] == ["A", "B"]
@@ -0,0 +1,238 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import streamlit as st
+
+from ebook import OLLAMA_MODEL, UsageMeter, checkpoint_path, generate_book, load_checkpoint
+from planner import TOTAL_FIELDS, RunPlanner, estimate_run, format_duration, load_totals, rates, record_run
+from render import FORMATS, render_all
+from resources import get_client, get_render_pool
+
+# What to tell the user when the LLM call after each "in progress" event fails
+ERROR_MESSAGES = {
+    "creating_chapters": "An error occurred: {e}",
+    "writing": "An error occurred while writing chapter {number}: {e}",
+    "summarizing": "An error occurred summarizing chapter: {e}",
+    "compacting": "An error occurred while summarizing the story so far: {e}",
+}
+
+
+def run_app(strategy):
+    """Streamlit front end shared by app0, app and app2; only the prompt strategy differs"""
+    st.title("Create An Ebook with Ollama")
+    st.caption(f"Using local model: {OLLAMA_MODEL}")
+    input_title = st.text_input("Book Title")
+    input_description = st.text_input("Book Description")
+    input_number = st.selectbox("Number Of Chapters", list(range(1, 21)), index=6)
+    input_words = st.number_input("Words Per Chapter", value=350, step=1)
+
+    with st.expander("Budget"):
+        input_minutes = st.number_input("Time budget in minutes (0 for none)", min_value=0, value=0, step=5)
+        input_tokens = st.number_input("Token budget (0 for none)", min_value=0, value=0, step=1000)
+
+    resume = None
+    saved_checkpoint = checkpoint_path(input_title, strategy.name) if input_title else None
+    if saved_checkpoint and os.path.exists(saved_checkpoint):
+        try:
+            checkpoint = load_checkpoint(saved_checkpoint)
+        except (OSError, ValueError) as e:
+            st.warning(f"Could not read the checkpoint {saved_checkpoint}: {e}")
+            checkpoint = {}
+        if checkpoint.get("strategy") == strategy.name and st.checkbox(
+            f"Resume from checkpoint ({len(checkpoint['chapters'])} of "
+            f"{checkpoint['number_of_chapters']} chapters written)"
+        ):
+            resume = checkpoint
+
+    # A resumed run only has the chapters after the checkpoint left to write
+    resume_point = {}
+    if resume:
+        resume_point = {
+            "start_chapter": len(resume["chapters"]) + 1,
+            "summary_words": len(resume["summary_so_far"].split()),
+        }
+        input_description = resume["description"]
+        input_number = resume["number_of_chapters"]
+        input_words = resume["words_per_chapter"]
+
+    # Estimate from the throughput measured on previous runs, refreshed whenever the form changes
+    try:
+        history = load_totals(OLLAMA_MODEL)
+    except ValueError as e:
+        st.warning(f"{e}. Estimates use default rates until it is fixed or removed.")
+        history = {field: 0 for field in TOTAL_FIELDS}
+    estimate = estimate_run(
+        strategy,
+        title=input_title,
+        description=input_description,
+        number_of_chapters=input_number,
+        words_per_chapter=input_words,
+        stats=rates(history),
+        **resume_point,
+    )
+    basis = f"measured over {history['calls']} calls" if history["calls"] else "default rates, no runs measured yet"
+    st.caption(
+        f"Estimated time: ~{format_duration(estimate['seconds'])}, "
+        f"~{estimate['prompt_tokens'] + estimate['generated_tokens']:,} tokens "
+        f"in {estimate['calls']} calls ({basis})"
+    )
+
+    submit_button = st.button("Submit")
+
+    # Clicking a download button reruns the script without Submit, so the finished files are
+    # kept in the session and offered again until the next book is generated
+    if "downloads" not in st.session_state:
+        st.session_state.downloads = {}
+    if not (submit_button and input_title):
+        for fmt, file_path in st.session_state.downloads.items():
+            _download_button(fmt, file_path)
+        return
+    st.session_state.downloads = {}
+
+    if resume:
+        st.write(f"Resuming from chapter {len(resume['chapters']) + 1}...")
+
+    meter = UsageMeter(get_client().generate)
+    planner = RunPlanner(
+        strategy,
+        title=input_title,
+        description=input_description,
+        number_of_chapters=input_number,
+        words_per_chapter=input_words,
+        model=OLLAMA_MODEL,
+        meter=meter,
+        max_seconds=input_minutes * 60 or None,
+        max_tokens=input_tokens or None,
+        history=history,
+    )
+    events = generate_book(
+        title=input_title,
+        description=input_description,
+        number_of_chapters=input_number,
+        words_per_chapter=input_words,
+        strategy=strategy,
+        generate=meter,
+        budget=planner,
+        resume=resume,
+    )
+    eta = st.empty()
+    status = st.empty()
+    # The step in progress, for the error message if its LLM call fails
+    stage, stage_data = None, {}
+    checkpointed = None
+    chapters = []
+    aborted = False
+
+    try:
+        for event, data in events:
+            if event in ERROR_MESSAGES:
+                stage, stage_data = event, data
+            if event == "creating_chapters":
+                status.info("Creating chapter list...")
+            elif event == "chapters":
+                # Display chapters
+                st.subheader("Chapters:")
+                for field in data["chapters"]:
+                    st.write(field.strip())
+            elif event == "writing":
+                # Add a note in the UI if this chapter will contain a twist
+                if data["twist"]:
+                    st.write(f"📝 Chapter {data['number']} will include an exciting plot twist!")
+                status.info(f"Writing Chapter {data['number']}...")
+            elif event == "chapter":
+                st.subheader(f"CHAPTER {data['number']}: {data['name']}")
+                st.write(data["text"])
+            elif event == "summarizing":
+                status.info(f"Summarizing chapter {data['number']}...")
+            elif event == "compacting":
+                st.write("Summary is getting long, reducing the story so far...")
+                status.info("Reviewing the story so far...")
+            elif event == "summary":
+                st.subheader(f"CHAPTER {data['number']} Summary")
+                st.write(data["text"])
+                remaining = planner.eta(data["number"] + 1, data["summary_words"])
+                eta.caption(
+                    f"Elapsed {format_duration(planner.elapsed)}, "
+                    f"about {format_duration(remaining)} remaining, "
+                    f"{planner.used_tokens:,} tokens used"
+                )
+            elif event == "adapting":
+                st.write(
+                    f"Shortening chapter summaries to {data['summary_words']} words to stay within budget"
+                )
+            elif event == "aborted":
+                aborted = True
+                st.warning(
+                    f"Stopped before chapter {data['number']}: {data['reason']}. "
+                    f"Progress saved to {data['checkpoint']}, tick resume to carry on."
+                )
+            elif event == "checkpointed":
+                # Sent just before the error that stopped the run is raised
+                checkpointed = data["checkpoint"]
+            elif event == "done":
+                chapters = data["chapters"]
+    except Exception as e:
+        status.empty()
+        st.error(ERROR_MESSAGES.get(stage, "An error occurred: {e}").format(e=e, **stage_data))
+        if checkpointed:
+            st.warning(f"Completed chapters are saved to {checkpointed}, tick resume to carry on.")
+        raise
+    finally:
+        # Every call feeds the next run's estimate, even if this run failed part way
+        if meter.calls:
+            try:
+                record_run(OLLAMA_MODEL, meter)
+            except (OSError, ValueError) as e:
+                st.warning(f"Could not save this run's throughput figures: {e}")
+    eta.empty()
+
+    if not chapters:
+        status.empty()
+        return
+    if not aborted and os.path.exists(saved_checkpoint):
+        # The book is complete, so there is nothing left to resume
+        os.remove(saved_checkpoint)
+
+    # Render every output format in parallel and offer each one as soon as it is ready
+    status.info(f"Rendering {', '.join(FORMATS)}...")
+    pending = set(FORMATS)
+    for attempt in range(2):
+        broken = []
+        for fmt, file_path, error in render_all(
+            input_title, chapters, formats=sorted(pending), executor=get_render_pool()
+        ):
+            if isinstance(error, BrokenProcessPool) and attempt == 0:
+                broken.append(fmt)
+                continue
+            pending.discard(fmt)
+            if error is not None:
+                st.error(f"An error occurred while creating the {fmt.upper()} file: {error}")
+                continue
+
+            st.session_state.downloads[fmt] = file_path
+            _download_button(fmt, file_path)
+            if pending:
+                status.info(f"Rendering {', '.join(sorted(pending))}...")
+        if not broken:
+            break
+        # A worker died and took the cached pool with it: start a fresh one and retry once
+        get_render_pool.clear()
+    status.empty()
+
+    if aborted:
+        # The budget stopped the run, so the files only hold the chapters written so far
+        st.info(f"Partial ebook written to file: {len(chapters)} of {input_number} chapters.")
+    else:
+        st.success("Ebook content written to file successfully!")
+
+
+def _download_button(fmt: str, file_path: str):
+    _, _, mime, label = FORMATS[fmt]
+    try:
+        with open(file_path, "rb") as f:
+            data = f.read()
+    except Exception as e:
+        st.error(f"An error occurred while reading the file: {e}")
+        return
+
+    st.download_button(label, data, os.path.basename(file_path), mime, key=f"download_{fmt}")